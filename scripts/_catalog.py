@@ -0,0 +1,42 @@
+"""
+Datasets, systems and result locations shared by the scripts in this directory.
+
+Scripts run as files (python scripts/<name>.py) or are imported by main.py --in-process;
+either way scripts/ is on sys.path, so this imports as a plain sibling module.
+"""
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional C parser; stdlib json is used otherwise
+    orjson = None
+
+# SNAP datasets, smallest to largest
+DATASETS = ("email-EuAll", "web-BerkStan", "soc-LiveJournal1")
+SYSTEMS = ("spark", "hadoop")
+
+# metrics/runner.py writes here (its --out-root default)
+METRICS_ROOT = Path("results/metrics")
+
+
+@lru_cache(maxsize=None)
+def results_root() -> Path:
+    """Job outputs root: the container mount (/data/results) if present, else ./results."""
+    container = Path("/data/results")
+    return container if container.exists() else Path("results")
+
+
+@lru_cache(maxsize=None)
+def load_summary(system: str, dataset: str) -> dict | None:
+    """summary.json of one metrics run, or None if missing."""
+    # Cached: callers read the same summaries once per metric; treat the result as read-only
+    path = METRICS_ROOT / system / dataset / "summary.json"
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    return orjson.loads(data) if orjson else json.loads(data)
@@ -0,0 +1,42 @@
+"""
+Edge-list parsing shared by the local Spark/Hadoop fallbacks and the fast Hadoop paths.
+
+The scripts under scripts/hadoop and scripts/spark add scripts/ to sys.path to import this.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+# Largest node id counted with a dense array indexed by id (2 GiB of int64)
+MAX_DENSE_ID = (1 << 28) - 1
+
+
+def read_dst(input_path: Path, dtype):
+    """Destination column of a '<src> <dst>' edge list as a pandas Series, '#' comment lines skipped.
+
+    Raises ValueError when the column does not parse as dtype, including integer ids
+    that overflow it, so callers can retry with dtype=str.
+    """
+    # Imported here so the streaming reducer can use MAX_DENSE_ID without loading pandas
+    import pandas as pd
+
+    # Parse with pandas' C tokenizer instead of a per-line Python loop (optimization)
+    try:
+        df = pd.read_csv(
+            input_path,
+            sep=r"\s+",
+            comment="#",
+            header=None,
+            usecols=[1],
+            names=["dst"],
+            dtype=dtype,
+            engine="c",
+            on_bad_lines="skip",
+            encoding_errors="ignore",
+            # Map the edge list instead of copying it through read() calls; matters for soc-LiveJournal1 (~1 GB).
+            # An empty file cannot be mapped, so read that one normally (it parses to an empty column)
+            memory_map=input_path.stat().st_size > 0,
+        )
+    except OverflowError as e:
+        raise ValueError(f"node id out of range for {dtype}: {e}") from e
+    return df["dst"]
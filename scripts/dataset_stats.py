@@ -7,17 +7,14 @@ Writes results to results/metrics/dataset_sizes.json
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
-DATASETS = [
-    "email-EuAll",
-    "web-BerkStan",
-    "soc-LiveJournal1",
-]
+from _catalog import DATASETS, METRICS_ROOT
 
 ROOT = Path(".")
 RAW = ROOT / "data" / "raw"
-OUT_DIR = ROOT / "results" / "metrics"
+OUT_DIR = METRICS_ROOT
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 OUT_FILE = OUT_DIR / "dataset_sizes.json"
 
@@ -25,11 +22,11 @@ OUT_FILE = OUT_DIR / "dataset_sizes.json"
 def main() -> int:
     sizes = {}
     for d in DATASETS:
-        path = RAW / f"{d}.txt"
-        if not path.exists():
+        # One stat() per file instead of exists() followed by stat()
+        try:
+            sizes[d] = os.stat(RAW / f"{d}.txt").st_size
+        except FileNotFoundError:
             sizes[d] = None
-            continue
-        sizes[d] = Path(path).stat().st_size
     OUT_FILE.write_text(json.dumps(sizes, indent=2), encoding="utf-8")
     print(f"Wrote {OUT_FILE}")
     return 0
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+In-memory NumPy reducer for '<key>\t<count>' streams.
+
+Drop-in replacement for reducer_in_degree.py / reducer_histogram.py when the
+reducer input fits in memory: sums counts per key in NumPy instead of a
+per-key Python loop, and does not need its input to be sorted (except when a
+count overflows int64 and the streaming reducer takes over). Keys are
+grouped as the exact bytes the streaming reducers compare; integer keys that
+are dense enough are summed directly by value, others go through np.unique.
+
+Usage (Hadoop Streaming):
+  -reducer "python scripts/hadoop/fast_reducer_indegree.py"
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # scripts/, for the shared _edges module
+from _edges import MAX_DENSE_ID
+
+# Largest max-id / row-count ratio summed with a dense array indexed by id
+DENSE_FACTOR = 4
+
+
+def _count(tok: bytes) -> int:
+    try:
+        return int(tok)
+    except ValueError:
+        return 0
+
+
+def read_pairs(data: bytes) -> tuple[np.ndarray, np.ndarray] | None:
+    """(keys, counts) from '<key>\\t<count>' lines, or None if a count does not fit in int64.
+
+    Like the streaming reducers, lines without exactly two fields are skipped
+    and a count that is not an integer adds 0.
+    """
+    pairs = [parts for parts in map(bytes.split, data.splitlines()) if len(parts) == 2]
+    keys = np.array([k for k, _ in pairs], dtype="S")
+    counts = [v for _, v in pairs]
+    try:
+        try:
+            vals = np.array(counts, dtype="S").astype(np.int64)
+        except ValueError:
+            vals = np.array([_count(v) for v in counts], dtype=np.int64)
+    except OverflowError:
+        return None
+    return keys, vals
+
+
+def _sum_by(index: np.ndarray, size: int, vals: np.ndarray) -> np.ndarray:
+    """Integer sum of vals per group index (no float weights, so large counts stay exact)."""
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, index, vals)
+    return sums
+
+
+def reduce_pairs(keys: np.ndarray, vals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct keys (byte-sorted, as Hadoop sorts reducer input) and their summed counts."""
+    try:
+        ids = keys.astype(np.int64)
+    except (ValueError, OverflowError):
+        ids = None
+    # Group on integer values only when that cannot merge keys: '007' and '7' stay separate lines
+    if ids is not None and not np.array_equal(ids.astype("S"), keys):
+        ids = None
+    if ids is None:
+        uniq, idx = np.unique(keys, return_inverse=True)
+        return uniq, _sum_by(idx, uniq.size, vals)
+    if ids.size and ids.min() >= 0 and ids.max() <= min(MAX_DENSE_ID, DENSE_FACTOR * ids.size):
+        # Ids are dense enough that an array indexed by id is no bigger than a few copies of the input
+        size = int(ids.max()) + 1
+        out_ids = np.flatnonzero(np.bincount(ids, minlength=size))
+        sums = _sum_by(ids, size, vals)[out_ids]
+    else:
+        out_ids, idx = np.unique(ids, return_inverse=True)
+        sums = _sum_by(idx, out_ids.size, vals)
+    out_keys = out_ids.astype("S")
+    order = np.argsort(out_keys, kind="stable")
+    return out_keys[order], sums[order]
+
+
+def main():
+    data = sys.stdin.buffer.read()
+    pairs = read_pairs(data)
+    if pairs is None:
+        # A count beyond int64: sum with Python ints in the streaming reducer (reducer input arrives key-sorted)
+        from reducer_in_degree import stream_reduce
+
+        stream_reduce(data.splitlines(), sys.stdout.buffer.write)
+        sys.stdout.buffer.flush()
+        return 0
+    out_keys, sums = reduce_pairs(*pairs)
+    lines = [b"%s\t%d\n" % (k, v) for k, v in zip(out_keys.tolist(), sums.tolist())]
+    sys.stdout.buffer.write(b"".join(lines))
+    sys.stdout.buffer.flush()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,9 +9,20 @@ Usage:
 from __future__ import annotations
 
 import argparse
-from collections import Counter
+import sys
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional: faster writer for large outputs
+    pa = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # scripts/, for the shared _edges module
+from _edges import MAX_DENSE_ID, read_dst
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser()
@@ -20,21 +31,32 @@ def parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
+def indegree_by_id(input_path: Path) -> np.ndarray | None:
+    """In-degree indexed by node id, or None when ids are not small non-negative integers."""
+    try:
+        dst = read_dst(input_path, np.int64).to_numpy()
+    except (ValueError, OverflowError):
+        # Non-integer ids, or ids beyond int64: the string path counts them
+        return None
+    if dst.size and (dst.min() < 0 or dst.max() > MAX_DENSE_ID):
+        return None
+    return np.bincount(dst)
+
+
+def write_pairs(path: Path, keys: np.ndarray, vals: np.ndarray) -> None:
+    """Write '<key>\t<value>' integer rows."""
+    if pa is None:
+        np.savetxt(path, np.column_stack([keys, vals]), fmt="%d\t%d")
+        return
+    # Arrow formats whole integer columns in C instead of one row at a time
+    table = pa.table({"key": pa.array(keys, pa.int64()), "value": pa.array(vals, pa.int64())})
+    pacsv.write_csv(table, str(path), pacsv.WriteOptions(include_header=False, delimiter="\t"))
+
+
 def main() -> int:
     args = parse_args()
-    indeg = Counter()
     input_path = Path(args.input)
-    # Larger buffering can reduce syscall overhead on big files (optimization)
-    with input_path.open("r", encoding="utf-8", errors="ignore", buffering=4*1024*1024) as f:
-        for line in f:
-            s = line.strip()
-            if not s or s.startswith('#'):
-                continue
-            parts = s.split()
-            if len(parts) < 2:
-                continue
-            dst = parts[1]
-            indeg[dst] += 1
+    indeg = indegree_by_id(input_path)
 
     out_root = Path(args.out)
     out_indeg = out_root / "indegree"
@@ -43,16 +65,19 @@ def main() -> int:
     out_dist.mkdir(parents=True, exist_ok=True)
 
     # Write single part file to mimic Hadoop
-    with (out_indeg / "part-r-00000").open("w", encoding="utf-8") as w:
-        for node, d in sorted(indeg.items(), key=lambda kv: kv[0]):
-            w.write(f"{node}\t{d}\n")
-
-    hist = Counter()
-    for d in indeg.values():
-        hist[d] += 1
-    with (out_dist / "part-r-00000").open("w", encoding="utf-8") as w:
-        for d, c in sorted(hist.items(), key=lambda kv: kv[0]):
-            w.write(f"{d}\t{c}\n")
+    if indeg is not None:
+        # SNAP node ids are integers: one bincount pass instead of hashing every edge
+        nodes = np.flatnonzero(indeg)
+        degrees = indeg[nodes]
+        write_pairs(out_indeg / "part-r-00000", nodes, degrees)
+    else:
+        counts = read_dst(input_path, str).value_counts().sort_index()
+        counts.to_csv(out_indeg / "part-r-00000", sep="\t", header=False)
+        degrees = counts.to_numpy()
+
+    hist = np.bincount(degrees)
+    dvals = np.flatnonzero(hist)
+    write_pairs(out_dist / "part-r-00000", dvals, hist[dvals])
 
     return 0
 
@@ -1,23 +1,39 @@
 #!/usr/bin/env python3
+import os
 import sys
+from collections import defaultdict
+
+BUFFER_SIZE = 1 << 20
+# Distinct keys held in memory before partial counts are flushed downstream
+FLUSH_THRESHOLD = int(os.environ.get("MAPPER_FLUSH_THRESHOLD", "500000"))
+
+
+def flush(write, counts):
+    for indeg, total in counts.items():
+        write(b"%d\t%d\n" % (indeg, total))
+    counts.clear()
 
 
 def main():
-    for line in sys.stdin:
-        s = line.strip()
-        if not s:
-            continue
-        parts = s.split('\t')
+    stdin = open(sys.stdin.fileno(), "rb", buffering=BUFFER_SIZE, closefd=False)
+    stdout = open(sys.stdout.fileno(), "wb", buffering=BUFFER_SIZE, closefd=False)
+    write = stdout.write
+    # Map-side combine: emit partial (indegree, count) pairs instead of one row per node
+    counts = defaultdict(int)
+    for line in stdin:
+        parts = line.split()
         if len(parts) != 2:
-            parts = s.split()
-            if len(parts) != 2:
-                continue
+            continue
         # parts: node    indegree
         try:
             indeg = int(parts[1])
         except ValueError:
             continue
-        sys.stdout.write(f"{indeg}\t1\n")
+        counts[indeg] += 1
+        if len(counts) >= FLUSH_THRESHOLD:
+            flush(write, counts)
+    flush(write, counts)
+    stdout.flush()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,37 @@
 #!/usr/bin/env python3
+import os
 import sys
+from collections import defaultdict
+
+COMMENTS = b"#"
+BUFFER_SIZE = 1 << 20
+# Distinct keys held in memory before partial counts are flushed downstream
+FLUSH_THRESHOLD = int(os.environ.get("MAPPER_FLUSH_THRESHOLD", "500000"))
+
+
+def flush(write, counts):
+    for key, total in counts.items():
+        write(b"%s\t%d\n" % (key, total))
+    counts.clear()
 
 
 def main():
-    for line in sys.stdin:
-        s = line.strip()
-        if not s or s.startswith('#'):
-            continue
-        toks = s.split()
-        if len(toks) < 2:
+    # Work on raw bytes with large buffers to skip per-line text decoding/encoding
+    stdin = open(sys.stdin.fileno(), "rb", buffering=BUFFER_SIZE, closefd=False)
+    stdout = open(sys.stdout.fileno(), "wb", buffering=BUFFER_SIZE, closefd=False)
+    write = stdout.write
+    # Map-side combine: emit partial (dst, count) pairs instead of (dst, 1) per edge
+    counts = defaultdict(int)
+    for line in stdin:
+        toks = line.split(None, 2)
+        # Checking the first token also skips indented '#' lines, like the fallbacks and the Spark job
+        if len(toks) < 2 or toks[0][:1] in COMMENTS:
             continue
-        dst = toks[1]
-        # Emit destination node with count 1
-        sys.stdout.write(f"{dst}\t1\n")
+        counts[toks[1]] += 1
+        if len(counts) >= FLUSH_THRESHOLD:
+            flush(write, counts)
+    flush(write, counts)
+    stdout.flush()
 
 
 if __name__ == "__main__":
@@ -1,26 +1,38 @@
 #!/usr/bin/env python3
+import os
 import sys
 
+BUFFER_SIZE = 1 << 20
+# Output rows collected before one joined write
+OUT_BATCH = 1 << 16
+# Set to 1 to sum the whole input in memory with fast_reducer_indegree.py instead of streaming
+IN_MEMORY = os.environ.get("REDUCER_IN_MEMORY") == "1"
 
-def emit(k, total):
+
+def emit(out, k, total):
     if k is None:
         return
-    sys.stdout.write(f"{k}\t{total}\n")
+    out.append(b"%s\t%d\n" % (k, total))
 
 
 def main():
+    if IN_MEMORY:
+        # NumPy group-by over the whole input; does not need sorted input but must fit in memory
+        from fast_reducer_indegree import main as reduce_in_memory
+
+        reduce_in_memory()
+        return
+    stdin = open(sys.stdin.fileno(), "rb", buffering=BUFFER_SIZE, closefd=False)
+    stdout = open(sys.stdout.fileno(), "wb", buffering=BUFFER_SIZE, closefd=False)
+    write = stdout.write
+    out = []
     current_k = None
     current_total = 0
-    for line in sys.stdin:
-        s = line.strip()
-        if not s:
-            continue
-        parts = s.split('\t')
+    for line in stdin:
+        parts = line.split()
         if len(parts) != 2:
-            parts = s.split()
-            if len(parts) != 2:
-                continue
-        k, v = parts[0], parts[1]
+            continue
+        k, v = parts
         try:
             cnt = int(v)
         except ValueError:
@@ -32,10 +44,15 @@ def main():
         if k == current_k:
             current_total += cnt
         else:
-            emit(current_k, current_total)
+            emit(out, current_k, current_total)
+            if len(out) >= OUT_BATCH:
+                write(b"".join(out))
+                out.clear()
             current_k = k
             current_total = cnt
-    emit(current_k, current_total)
+    emit(out, current_k, current_total)
+    write(b"".join(out))
+    stdout.flush()
 
 
 if __name__ == "__main__":
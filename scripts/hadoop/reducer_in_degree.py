@@ -1,27 +1,44 @@
 #!/usr/bin/env python3
+import os
 import sys
 
+BUFFER_SIZE = 1 << 20
+# Output rows collected before one joined write
+OUT_BATCH = 1 << 16
+# Set to 1 to sum the whole input in memory with fast_reducer_indegree.py instead of streaming
+IN_MEMORY = os.environ.get("REDUCER_IN_MEMORY") == "1"
 
-def emit(key, total):
+
+def emit(out, key, total):
     if key is None:
         return
-    sys.stdout.write(f"{key}\t{total}\n")
+    out.append(b"%s\t%d\n" % (key, total))
 
 
 def main():
+    if IN_MEMORY:
+        # NumPy group-by over the whole input; does not need sorted input but must fit in memory
+        from fast_reducer_indegree import main as reduce_in_memory
+
+        reduce_in_memory()
+        return
+    stdin = open(sys.stdin.fileno(), "rb", buffering=BUFFER_SIZE, closefd=False)
+    stdout = open(sys.stdout.fileno(), "wb", buffering=BUFFER_SIZE, closefd=False)
+    stream_reduce(stdin, stdout.write)
+    stdout.flush()
+
+
+def stream_reduce(lines, write):
+    """Sum '<key> <count>' lines that arrive grouped by key (Hadoop sorts reducer input)."""
+    out = []
     current_key = None
     current_total = 0
-    for line in sys.stdin:
-        s = line.strip()
-        if not s:
-            continue
-        parts = s.split('\t')
+    for line in lines:
+        # Whitespace split covers both tab- and space-separated input
+        parts = line.split()
         if len(parts) != 2:
-            # try space split
-            parts = s.split()
-            if len(parts) != 2:
-                continue
-        key, val = parts[0], parts[1]
+            continue
+        key, val = parts
         try:
             cnt = int(val)
         except ValueError:
@@ -33,11 +50,14 @@ def main():
         if key == current_key:
             current_total += cnt
         else:
-            emit(current_key, current_total)
+            emit(out, current_key, current_total)
+            if len(out) >= OUT_BATCH:
+                write(b"".join(out))
+                out.clear()
             current_key = key
             current_total = cnt
-    emit(current_key, current_total)
-
+    emit(out, current_key, current_total)
+    write(b"".join(out))
 
 if __name__ == "__main__":
     main()
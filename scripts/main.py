@@ -16,21 +16,23 @@ Usage examples (Windows PowerShell):
   python scripts/main.py --no-optimized      # skip optimized runs/plots
   python scripts/main.py --steps validate plots  # run a subset of steps
   python scripts/main.py --dry-run           # print what would run
+  python scripts/main.py --parallel 2        # run two optimized jobs at a time
 """
 from __future__ import annotations
 
 import argparse
+import importlib
 import shlex
 import subprocess
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _catalog import DATASETS
 
-DEFAULT_DATASETS = [
-    "email-EuAll",
-    "web-BerkStan",
-    "soc-LiveJournal1",
-]
+
+DEFAULT_DATASETS = list(DATASETS)
 
 
 def run(cmd: list[str] | str, dry: bool = False) -> int:
@@ -48,10 +50,35 @@ def run(cmd: list[str] | str, dry: bool = False) -> int:
 
 
 class PipelineRunner:
-    def __init__(self, datasets: list[str], optimized: bool, dry_run: bool) -> None:
+    def __init__(
+        self, datasets: list[str], optimized: bool, dry_run: bool, parallel: int = 1, in_process: bool = False,
+    ) -> None:
         self.datasets = datasets
         self.optimized = optimized
         self.dry = dry_run
+        self.parallel = max(1, parallel)
+        self.in_process = in_process
+
+    def run_script(self, name: str) -> int:
+        """Run scripts/<name>.py, or call its main() in this interpreter with --in-process."""
+        if not self.in_process:
+            return run([sys.executable, f"scripts/{name}.py"], self.dry)
+        print(f"$ {name}.main()  # in-process")
+        if self.dry:
+            return 0
+        # scripts/ is on sys.path (this file's directory), so sibling scripts import as modules;
+        # pandas/matplotlib are then only imported once for all steps
+        try:
+            return importlib.import_module(name).main() or 0
+        except SystemExit as e:
+            # sys.exit() / SystemExit(None) is success; a message or other non-int code is a failure
+            if e.code is None:
+                return 0
+            return e.code if isinstance(e.code, int) else 1
+        except Exception:
+            # Same as a failing subprocess: report and carry on with the next step
+            traceback.print_exc()
+            return 1
 
     def ensure_python_deps(self) -> None:
         print("\n=== Ensure Python dependencies ===")
@@ -80,50 +107,54 @@ class PipelineRunner:
 
     def validate(self) -> None:
         print("\n=== Validate results correctness (Hadoop vs Spark) ===")
-        run([sys.executable, "scripts/validate_results.py"], self.dry)
+        self.run_script("validate_results")
 
     def plot_distributions(self) -> None:
         print("\n=== Plot in-degree distributions ===")
-        run([sys.executable, "scripts/plot_distributions.py"], self.dry)
+        self.run_script("plot_distributions")
 
     def metrics_plots(self) -> None:
         print("\n=== Plot per-dataset performance metrics ===")
-        run([sys.executable, "scripts/plot_metrics.py"], self.dry)
+        self.run_script("plot_metrics")
 
     def dataset_sizes(self) -> None:
         print("\n=== Compute dataset sizes ===")
-        run([sys.executable, "scripts/dataset_stats.py"], self.dry)
+        self.run_script("dataset_stats")
 
     def scaling_plots(self) -> None:
         print("\n=== Plot scaling trends ===")
-        run([sys.executable, "scripts/plot_scaling.py"], self.dry)
+        self.run_script("plot_scaling")
 
     def optimized_runs(self) -> None:
         if not self.optimized:
             return
         print("\n=== Run optimized variants and collect metrics ===")
+        # One pool for all (dataset, system) jobs so Spark and Hadoop runs interleave
+        cmds = []
         for d in self.datasets:
             # Spark optimized (system label: spark_opt)
-            run([
+            cmds.append([
                 sys.executable, "scripts/metrics/runner.py",
                 "--system", "spark_opt", "--dataset", d, "--",
                 "powershell.exe", "-ExecutionPolicy", "Bypass", "-File",
                 "scripts/spark/run_spark_job.ps1", "-Dataset", d,
-            ], self.dry)
-        for d in self.datasets:
+            ])
             # Hadoop optimized (system label: hadoop_opt)
-            run([
+            cmds.append([
                 sys.executable, "scripts/metrics/runner.py",
                 "--system", "hadoop_opt", "--dataset", d, "--",
                 "powershell.exe", "-ExecutionPolicy", "Bypass", "-File",
                 "scripts/hadoop/run_hadoop_job.ps1", "-Dataset", d,
-            ], self.dry)
+            ])
+        # Each job is its own subprocess, so threads are enough to wait on them
+        with ThreadPoolExecutor(max_workers=self.parallel) as ex:
+            list(ex.map(lambda c: run(c, self.dry), cmds))
 
     def optimization_plots(self) -> None:
         if not self.optimized:
             return
         print("\n=== Plot before/after optimization comparisons ===")
-        run([sys.executable, "scripts/plot_optimizations.py"], self.dry)
+        self.run_script("plot_optimizations")
 
     def run_all(self, steps: list[str]) -> None:
         # Step registry
@@ -164,12 +195,24 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--steps", nargs="*", default=["all"], help="Subset of steps to run (default: all)")
     p.add_argument("--no-optimized", dest="optimized", action="store_false", help="Skip optimized runs/plots")
     p.add_argument("--dry-run", action="store_true", help="Print commands without executing")
+    p.add_argument(
+        "--parallel", type=int, default=1,
+        help="Optimized runs to execute at once (default: 1). The metrics runner samples system-wide "
+        "counters, so concurrent runs record each other's load and are not comparable to the baselines",
+    )
+    p.add_argument(
+        "--in-process", action="store_true",
+        help="Run the validate/sizes/plot steps inside this interpreter instead of a new Python each",
+    )
     return p.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    runner = PipelineRunner(datasets=args.datasets, optimized=args.optimized, dry_run=args.dry_run)
+    runner = PipelineRunner(
+        datasets=args.datasets, optimized=args.optimized, dry_run=args.dry_run, parallel=args.parallel,
+        in_process=args.in_process,
+    )
     runner.run_all(args.steps)
     return 0
 
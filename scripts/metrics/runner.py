@@ -13,8 +13,9 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import csv
 import json
+import os
+import selectors
 import subprocess
 import sys
 import time
@@ -22,6 +23,19 @@ from pathlib import Path
 
 import psutil
 
+try:
+    import orjson
+except ImportError:  # optional C encoder; stdlib json is used otherwise
+    orjson = None
+
+# psutil recommends at least 0.1 s between cpu_percent() calls for accuracy
+MAX_POLL_HZ = 10.0
+# Timeseries rows buffered before each write() call
+WRITE_BATCH = 64
+PROBES = ("cpu", "mem", "disk", "net")
+# Unchanged I/O counter reads before a probe backs off to every IDLE_SAMPLES-th sample
+IDLE_SAMPLES = 5
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser()
@@ -29,18 +43,141 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--dataset", required=True, help="Dataset name")
     p.add_argument("--out-root", default="results/metrics", help="Root output directory")
     p.add_argument("--interval", type=float, default=1.0, help="Sampling interval seconds")
+    p.add_argument(
+        "--burst-ms",
+        type=float,
+        default=0.0,
+        help="Poll CPU for this many ms at each sample to catch short spikes (default: 0, single read)",
+    )
+    p.add_argument("--poll-hz", type=float, default=10.0, help=f"CPU poll rate within a burst (max {MAX_POLL_HZ:g})")
+    p.add_argument(
+        "--probes",
+        default=",".join(PROBES),
+        help="Comma-separated metrics to sample (default: cpu,mem,disk,net); disabled columns are left empty",
+    )
     p.add_argument("cmd", nargs=argparse.REMAINDER, help="Command to run (prefix with --)")
     args = p.parse_args()
     if not args.cmd:
         print("Missing command after --", file=sys.stderr)
         sys.exit(2)
+    args.probes = {x.strip() for x in args.probes.split(",") if x.strip()}
+    unknown = args.probes - set(PROBES)
+    if unknown:
+        p.error(f"unknown probes: {', '.join(sorted(unknown))} (choose from {', '.join(PROBES)})")
+    if args.poll_hz <= 0:
+        p.error("--poll-hz must be positive")
+    # A burst must end before the next sample is due (the sampling period is at least 1 / MAX_POLL_HZ)
+    period = max(args.interval, 1.0 / MAX_POLL_HZ)
+    if not 0 <= args.burst_ms / 1000.0 < period:
+        p.error(f"--burst-ms must be at least 0 and shorter than the sampling interval ({period * 1000:g} ms)")
     return args
 
 
+def write_json_atomic(path: Path, obj: dict) -> None:
+    """Write compact JSON to a temp file and rename it over path, so readers never see a partial file."""
+    data = orjson.dumps(obj) if orjson else json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def now_monotonic() -> float:
     return time.perf_counter()
 
 
+class CpuSampler:
+    """System CPU% between samples, optionally polled in a short burst to catch spikes."""
+
+    def __init__(self, burst_s: float, poll_s: float) -> None:
+        self.burst_s = burst_s
+        self.poll_s = poll_s
+        psutil.cpu_percent(None)  # prime
+        self.last = now_monotonic()
+
+    def sample(self) -> tuple[float, float]:
+        """Return (time-weighted average, peak) CPU% since the previous sample."""
+        start = now = self.last
+        cpu = psutil.cpu_percent(interval=None)
+        t = now_monotonic()
+        weighted = cpu * (t - now)
+        peak = cpu
+        now = t
+        burst_end = now + self.burst_s
+        while now + self.poll_s <= burst_end:
+            time.sleep(self.poll_s)
+            cpu = psutil.cpu_percent(interval=None)
+            t = now_monotonic()
+            weighted += cpu * (t - now)
+            peak = max(peak, cpu)
+            now = t
+        self.last = now
+        span = now - start
+        return (weighted / span if span > 0 else cpu), peak
+
+
+def disk_bytes() -> tuple[int, int] | None:
+    io = psutil.disk_io_counters()
+    return (io.read_bytes, io.write_bytes) if io else None
+
+
+def net_bytes() -> tuple[int, int] | None:
+    net = psutil.net_io_counters()
+    return (net.bytes_sent, net.bytes_recv) if net else None
+
+
+class CounterProbe:
+    """Cumulative I/O counters, read less often while they stay unchanged.
+
+    After IDLE_SAMPLES identical reads only every IDLE_SAMPLES-th sample reads
+    the counters; the ones in between repeat the last value. Any change goes
+    back to reading every sample.
+    """
+
+    def __init__(self, read) -> None:
+        self.read = read
+        self.last = read()
+        self.idle = 0
+        self.skipped = 0
+
+    def sample(self) -> tuple[int, int] | None:
+        if self.idle >= IDLE_SAMPLES and self.skipped < IDLE_SAMPLES - 1:
+            self.skipped += 1
+            return self.last
+        self.skipped = 0
+        cur = self.read()
+        self.idle = self.idle + 1 if cur == self.last else 0
+        self.last = cur
+        return cur
+
+
+class ExitWaiter:
+    """Sleep between samples, waking early when the child exits.
+
+    Uses a pidfd on Linux so the final sample is taken right after the job
+    ends; elsewhere it is a plain sleep and the exit is seen at the next poll().
+    """
+
+    def __init__(self, proc: subprocess.Popen) -> None:
+        self.sel = None
+        try:
+            self.fd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):  # not Linux 5.3+ / Python 3.9+
+            return
+        self.sel = selectors.DefaultSelector()
+        self.sel.register(self.fd, selectors.EVENT_READ)
+
+    def wait(self, timeout: float) -> None:
+        if self.sel is None:
+            time.sleep(timeout)
+        else:
+            self.sel.select(timeout)
+
+    def close(self) -> None:
+        if self.sel is not None:
+            self.sel.close()
+            os.close(self.fd)
+
+
 def main() -> int:
     args = parse_args()
     out_dir = Path(args.out_root) / args.system / args.dataset
@@ -48,20 +185,19 @@ def main() -> int:
     csv_path = out_dir / "timeseries.csv"
     summary_path = out_dir / "summary.json"
 
-    # Initialize psutil metrics
-    psutil.cpu_percent(None)  # prime
-    psutil.virtual_memory()
-    io0 = psutil.disk_io_counters()
-    net0 = psutil.net_io_counters()
-    base_read = io0.read_bytes if io0 else 0
-    base_write = io0.write_bytes if io0 else 0
-    base_sent = net0.bytes_sent if net0 else 0
-    base_recv = net0.bytes_recv if net0 else 0
+    # Initialize psutil metrics; disabled probes are never called in the loop
+    probes = args.probes
+    cpu_sampler = CpuSampler(args.burst_ms / 1000.0, 1.0 / min(args.poll_hz, MAX_POLL_HZ)) if "cpu" in probes else None
+    base_read, base_write = disk_bytes() or (0, 0)
+    base_sent, base_recv = net_bytes() or (0, 0)
+    disk_probe = CounterProbe(disk_bytes) if "disk" in probes else None
+    net_probe = CounterProbe(net_bytes) if "net" in probes else None
 
     start_wall = now_monotonic()
     start_time = time.time()
     cmd = args.cmd[1:] if args.cmd and args.cmd[0] == "--" else args.cmd
     proc = subprocess.Popen(cmd)
+    waiter = ExitWaiter(proc)
 
     fields = [
         "t_sec",
@@ -72,51 +208,58 @@ def main() -> int:
         "disk_write_bytes",
         "net_sent_bytes",
         "net_recv_bytes",
+        "cpu_peak_percent",
     ]
     samples = 0
-    max_mem_used_mb = 0.0
-    peak_cpu = 0.0
+    max_mem_used_mb = 0.0 if "mem" in probes else None
+    peak_cpu = 0.0 if cpu_sampler else None
+    # Samples are scheduled on a fixed period so the CPU burst counts towards it
+    period = max(args.interval, 1.0 / MAX_POLL_HZ)
+    next_sample = now_monotonic()
 
-    with csv_path.open("w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(fields)
+    with csv_path.open("w", newline="", buffering=1 << 20) as f:
+        # All values are numbers, so rows are formatted directly instead of going through csv.writer
+        f.write(",".join(fields) + "\n")
+        batch: list[str] = []
         while True:
             ret = proc.poll()
             t = now_monotonic() - start_wall
-            cpu = psutil.cpu_percent(interval=None)
-            mem = psutil.virtual_memory()
-            io = psutil.disk_io_counters()
-            net = psutil.net_io_counters()
-            read_bytes = io.read_bytes if io else base_read
-            write_bytes = io.write_bytes if io else base_write
-            sent_bytes = net.bytes_sent if net else base_sent
-            recv_bytes = net.bytes_recv if net else base_recv
-            used_mb = (mem.total - mem.available) / (1024 * 1024)
-            w.writerow([
-                f"{t:.3f}",
-                f"{cpu:.2f}",
-                f"{used_mb:.2f}",
-                f"{mem.percent:.2f}",
-                read_bytes,
-                write_bytes,
-                sent_bytes,
-                recv_bytes,
-            ])
+            # Columns of disabled probes stay empty
+            cpu_s = peak_s = used_s = pct_s = ""
+            disk_s = net_s = ","
+            if cpu_sampler:
+                cpu, cpu_peak = cpu_sampler.sample()
+                cpu_s = f"{cpu:.2f}"
+                peak_s = f"{cpu_peak:.2f}"
+                peak_cpu = max(peak_cpu, cpu_peak)
+            if max_mem_used_mb is not None:
+                mem = psutil.virtual_memory()
+                used_mb = (mem.total - mem.available) / (1024 * 1024)
+                used_s = f"{used_mb:.2f}"
+                pct_s = f"{mem.percent:.2f}"
+                max_mem_used_mb = max(max_mem_used_mb, used_mb)
+            if disk_probe:
+                read_bytes, write_bytes = disk_probe.sample() or (base_read, base_write)
+                disk_s = f"{read_bytes},{write_bytes}"
+            if net_probe:
+                sent_bytes, recv_bytes = net_probe.sample() or (base_sent, base_recv)
+                net_s = f"{sent_bytes},{recv_bytes}"
+            batch.append(f"{t:.3f},{cpu_s},{used_s},{pct_s},{disk_s},{net_s},{peak_s}\n")
+            if len(batch) >= WRITE_BATCH:
+                f.write("".join(batch))
+                batch.clear()
             samples += 1
-            max_mem_used_mb = max(max_mem_used_mb, used_mb)
-            peak_cpu = max(peak_cpu, cpu)
             if ret is not None:
+                f.write("".join(batch))
                 break
-            time.sleep(max(args.interval, 0.2))
+            next_sample += period
+            waiter.wait(max(next_sample - now_monotonic(), 0.0))
+    waiter.close()
 
     end_wall = now_monotonic()
     end_time = time.time()
-    io1 = psutil.disk_io_counters()
-    net1 = psutil.net_io_counters()
-    end_read = io1.read_bytes if io1 else base_read
-    end_write = io1.write_bytes if io1 else base_write
-    end_sent = net1.bytes_sent if net1 else base_sent
-    end_recv = net1.bytes_recv if net1 else base_recv
+    end_read, end_write = disk_bytes() or (base_read, base_write)
+    end_sent, end_recv = net_bytes() or (base_sent, base_recv)
     elapsed = end_wall - start_wall
 
     summary = {
@@ -135,8 +278,7 @@ def main() -> int:
         "samples": samples,
     "cmd": cmd,
     }
-    with summary_path.open("w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2)
+    write_json_atomic(summary_path, summary)
 
     return 0
 
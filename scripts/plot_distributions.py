@@ -10,39 +10,69 @@ Writes PNG plots to /results/plots.
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
+import os
 import sys
+from functools import lru_cache, partial
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 
+import matplotlib
+
+matplotlib.use("Agg")  # no display needed; also safe in worker processes
+# Simplify long paths and draw them in chunks so Agg does not rasterize one huge path
+matplotlib.rcParams["path.simplify"] = True
+matplotlib.rcParams["agg.path.chunksize"] = 10000
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from _catalog import DATASETS, results_root
 
 
 # Prefer container mount (/data/results); fall back to local ./results
-RESULTS = Path("/data/results") if Path("/data/results").exists() else Path("results")
+RESULTS = results_root()
 PLOTS = RESULTS / "plots"
 
 
+def _read_part(part: Path) -> np.ndarray:
+    """(key, value) int64 rows of one part file."""
+    try:
+        return np.loadtxt(part, dtype=np.int64, usecols=(0, 1), ndmin=2)
+    except ValueError:
+        # Non-numeric or short rows: parse as text and drop what does not convert
+        df = pd.read_csv(
+            part, sep=r"\s+", header=None, names=["k", "v"], usecols=[0, 1], dtype=str, on_bad_lines="skip",
+            memory_map=True,
+        )
+        return df.apply(pd.to_numeric, errors="coerce").dropna().to_numpy(dtype=np.int64).reshape(-1, 2)
+
+
 def read_tsv_dir(dir_path: Path) -> List[Tuple[int, int]]:
-    data: Dict[int, int] = {}
     if not dir_path.exists():
         return []
-    for part in sorted(dir_path.glob("part-*")):
-        with part.open("r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                s = line.strip()
-                if not s:
-                    continue
-                kv = s.split()
-                if len(kv) < 2:
-                    continue
-                try:
-                    k = int(kv[0])
-                    v = int(kv[1])
-                except ValueError:
-                    continue
-                data[k] = data.get(k, 0) + v
-    items = sorted(data.items())
-    return items
+    # Spark leaves empty part files for empty partitions; skip them rather than parse nothing
+    parts = [_read_part(part) for part in sorted(dir_path.glob("part-*")) if part.stat().st_size]
+    pairs = np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int64)
+    if not len(pairs):
+        return []
+    keys, vals = pairs[:, 0], pairs[:, 1]
+    # Sum values per key with one bincount over all parts (degrees are non-negative)
+    if keys.min() >= 0:
+        uniq = np.flatnonzero(np.bincount(keys))
+        sums = np.bincount(keys, weights=vals)[uniq]
+    else:
+        uniq, idx = np.unique(keys, return_inverse=True)
+        sums = np.bincount(idx, weights=vals)
+    return list(zip(uniq.tolist(), sums.astype(np.int64).tolist()))
+
+
+@lru_cache(maxsize=None)
+def _canvas():
+    """One figure per process, cleared and reused for every plot."""
+    return plt.subplots(figsize=(7, 5))
 
 
 def _find_spark_dist_dir(dataset: str) -> Path:
@@ -63,12 +93,37 @@ def _find_spark_dist_dir(dataset: str) -> Path:
     return exact
 
 
-def plot_dataset(name: str) -> None:
+def _input_signature(dirs: list[Path]) -> str:
+    """Hash of the path, size and mtime of every part file the plots are built from."""
+    stats = []
+    for d in dirs:
+        for part in sorted(d.glob("part-*")) if d.exists() else []:
+            st = part.stat()
+            stats.append((str(part), st.st_size, st.st_mtime_ns))
+    return hashlib.sha1(repr(stats).encode("utf-8")).hexdigest()
+
+
+def _up_to_date(sig_path: Path, sig: str) -> bool:
+    """True when sig_path records sig and every plot written with it still exists."""
+    try:
+        recorded, *outputs = sig_path.read_text().splitlines()
+    except (FileNotFoundError, ValueError):
+        return False
+    return recorded == sig and bool(outputs) and all((PLOTS / o).exists() for o in outputs)
+
+
+def plot_dataset(name: str, force: bool = False) -> None:
     spark_dir = _find_spark_dist_dir(name)
     # Hadoop distributions (standardized under /data/results/hadoop)
     hadoop_dir1 = RESULTS / "hadoop" / name / "distribution"
     # Legacy fallback when outputs were under /results/hadoop on host
     hadoop_dir2 = Path("/results/hadoop") / name / "distribution"
+    # Skip reading and re-rendering when the inputs match the last run's signature and its plots are all there
+    sig = _input_signature([spark_dir, hadoop_dir1, hadoop_dir2])
+    sig_path = PLOTS / f"{name}.png.sha1"
+    if not force and _up_to_date(sig_path, sig):
+        print(f"Up to date: {name}")
+        return
     spark_data = read_tsv_dir(spark_dir)
     hadoop_data = read_tsv_dir(hadoop_dir1) or read_tsv_dir(hadoop_dir2)
     if not spark_data and not hadoop_data:
@@ -76,26 +131,28 @@ def plot_dataset(name: str) -> None:
         return
 
     PLOTS.mkdir(parents=True, exist_ok=True)
+    written = []
 
     def _plot(loglog: bool, suffix: str):
-        plt.figure(figsize=(7, 5))
+        fig, ax = _canvas()
+        ax.clear()
         if spark_data:
             x, y = zip(*spark_data)
-            plt.scatter(x, y, s=10, label="Spark", alpha=0.7)
+            ax.scatter(x, y, s=10, label="Spark", alpha=0.7)
         if hadoop_data:
             x, y = zip(*hadoop_data)
-            plt.scatter(x, y, s=10, label="Hadoop", alpha=0.7)
+            ax.scatter(x, y, s=10, label="Hadoop", alpha=0.7)
         if loglog:
-            plt.xscale("log")
-            plt.yscale("log")
-        plt.xlabel("In-degree")
-        plt.ylabel("#Nodes")
-        plt.title(f"In-degree distribution: {name}{' (log-log)' if loglog else ''}")
-        plt.legend()
-        plt.tight_layout()
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+        ax.set_xlabel("In-degree")
+        ax.set_ylabel("#Nodes")
+        ax.set_title(f"In-degree distribution: {name}{' (log-log)' if loglog else ''}")
+        ax.legend()
+        fig.tight_layout()
         out = PLOTS / f"{name}{suffix}.png"
-        plt.savefig(out)
-        plt.close()
+        fig.savefig(out)
+        written.append(out.name)
         print(f"Wrote {out}")
 
     _plot(False, "")
@@ -105,37 +162,39 @@ def plot_dataset(name: str) -> None:
     def _plot_single(series: list[tuple[int, int]], label: str, color: str, loglog: bool, out_name: str):
         if not series:
             return
-        plt.figure(figsize=(7, 5))
+        fig, ax = _canvas()
+        ax.clear()
         x, y = zip(*series)
-        plt.scatter(x, y, s=10, label=label, alpha=0.8, color=color)
+        ax.scatter(x, y, s=10, label=label, alpha=0.8, color=color)
         if loglog:
-            plt.xscale("log")
-            plt.yscale("log")
-        plt.xlabel("In-degree")
-        plt.ylabel("#Nodes")
-        plt.title(f"{label} in-degree: {name}{' (log-log)' if loglog else ''}")
-        plt.legend()
-        plt.tight_layout()
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+        ax.set_xlabel("In-degree")
+        ax.set_ylabel("#Nodes")
+        ax.set_title(f"{label} in-degree: {name}{' (log-log)' if loglog else ''}")
+        ax.legend()
+        fig.tight_layout()
         out = PLOTS / out_name
-        plt.savefig(out)
-        plt.close()
+        fig.savefig(out)
+        written.append(out.name)
         print(f"Wrote {out}")
 
     _plot_single(spark_data, "Spark", "tab:blue", False, f"{name}_spark.png")
     _plot_single(spark_data, "Spark", "tab:blue", True, f"{name}_spark_loglog.png")
     _plot_single(hadoop_data, "Hadoop", "tab:orange", False, f"{name}_hadoop.png")
     _plot_single(hadoop_data, "Hadoop", "tab:orange", True, f"{name}_hadoop_loglog.png")
-
-
-def main(argv: list[str]) -> int:
-    datasets = [
-        "soc-Pokec-relationships",
-        "email-EuAll",
-        "web-BerkStan",
-        "soc-LiveJournal1",
-    ]
-    for d in datasets:
-        plot_dataset(d)
+    # Signature first, then the plots it covers
+    sig_path.write_text("\n".join([sig, *written]) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--force", action="store_true", help="Re-plot even if the inputs have not changed")
+    args = p.parse_args(argv[1:] if argv else [])
+    datasets = ["soc-Pokec-relationships", *DATASETS]
+    # Datasets are independent, so read + plot them in parallel
+    with Pool(min(len(datasets), os.cpu_count() or 1)) as pool:
+        pool.map(partial(plot_dataset, force=args.force), datasets)
     return 0
 
 
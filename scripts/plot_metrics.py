@@ -11,21 +11,25 @@ Produces per-dataset figures under results/metrics/plots/:
 from __future__ import annotations
 
 import json
-from pathlib import Path
+import os
+from functools import lru_cache
+from multiprocessing import Pool
 from typing import Dict
 
+import matplotlib
+
+matplotlib.use("Agg")  # no display needed; also safe in worker processes
+# Simplify long paths and draw them in chunks so Agg does not rasterize one huge path
+matplotlib.rcParams["path.simplify"] = True
+matplotlib.rcParams["agg.path.chunksize"] = 10000
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+from _catalog import DATASETS, METRICS_ROOT as ROOT, SYSTEMS
+
 
-ROOT = Path("results/metrics")
 PLOTS = ROOT / "plots"
-SYSTEMS = ["spark", "hadoop"]
-DATASETS = [
-    "email-EuAll",
-    "web-BerkStan",
-    "soc-LiveJournal1",
-]
 
 
 def load_timeseries(system: str, dataset: str) -> pd.DataFrame | None:
@@ -38,11 +42,17 @@ def load_timeseries(system: str, dataset: str) -> pd.DataFrame | None:
     for col in ["disk_read_bytes", "disk_write_bytes", "net_sent_bytes", "net_recv_bytes"]:
         if col not in df.columns:
             df[col] = 0
-    df["disk_bytes_total"] = df["disk_read_bytes"] + df["disk_write_bytes"]
-    df["net_bytes_total"] = df["net_sent_bytes"] + df["net_recv_bytes"]
-    for col in ["disk_bytes_total", "net_bytes_total"]:
-        df[col + "_rate"] = df[col].diff().fillna(0) / df["t_sec"].diff().fillna(1)
-        df[col + "_rate"] = df[col + "_rate"].clip(lower=0)
+    # One pass over the raw arrays instead of Series diff/fillna/clip per column
+    t = df["t_sec"].to_numpy(dtype=float)
+    dt = np.diff(t, prepend=t[:1])
+    dt[dt == 0] = 1
+    for col, (a, b) in {
+        "disk_bytes_total": ("disk_read_bytes", "disk_write_bytes"),
+        "net_bytes_total": ("net_sent_bytes", "net_recv_bytes"),
+    }.items():
+        total = df[a].to_numpy(dtype=float) + df[b].to_numpy(dtype=float)
+        df[col] = total
+        df[col + "_rate"] = np.maximum(np.diff(total, prepend=total[:1]) / dt, 0)
     return df
 
 
@@ -53,6 +63,23 @@ def load_summary(system: str, dataset: str) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+# Figures are built once per process and cleared for each dataset
+@lru_cache(maxsize=None)
+def _timeseries_canvas():
+    fig, ax = plt.subplots(figsize=(10, 5))
+    return fig, ax, ax.twinx()
+
+
+@lru_cache(maxsize=None)
+def _io_canvas():
+    return plt.subplots(figsize=(10, 5))
+
+
+@lru_cache(maxsize=None)
+def _summary_canvas():
+    return plt.subplots(1, 3, figsize=(12, 4))
+
+
 def plot_dataset(dataset: str) -> None:
     PLOTS.mkdir(parents=True, exist_ok=True)
     dfs: Dict[str, pd.DataFrame] = {}
@@ -62,61 +89,77 @@ def plot_dataset(dataset: str) -> None:
         sums[sysname] = load_summary(sysname, dataset)
 
     # CPU + Memory time series
-    plt.figure(figsize=(10, 5))
+    fig, ax, ax2 = _timeseries_canvas()
+    ax.clear()
+    ax2.clear()
+    ax2.yaxis.set_label_position("right")  # clear() moves the twin's label back to the left
+    # Legend entries for both axes, collected while plotting
+    handles, labels = [], []
     for sysname, color in [("spark", "tab:blue"), ("hadoop", "tab:orange")]:
         df = dfs.get(sysname)
         if df is None:
             continue
-        plt.plot(df["t_sec"], df["cpu_percent"], label=f"{sysname} CPU%", color=color, alpha=0.8)
-    ax = plt.gca()
-    ax2 = ax.twinx()
+        label = f"{sysname} CPU%"
+        (line,) = ax.plot(df["t_sec"], df["cpu_percent"], label=label, color=color, alpha=0.8)
+        handles.append(line)
+        labels.append(label)
     for sysname, color in [("spark", "tab:blue"), ("hadoop", "tab:orange")]:
         df = dfs.get(sysname)
         if df is None:
             continue
-        ax2.plot(df["t_sec"], df["mem_used_mb"], label=f"{sysname} Mem MB", color=color, linestyle="--", alpha=0.7)
+        label = f"{sysname} Mem MB"
+        (line,) = ax2.plot(df["t_sec"], df["mem_used_mb"], label=label, color=color, linestyle="--", alpha=0.7)
+        handles.append(line)
+        labels.append(label)
     ax.set_xlabel("Time (s)")
     ax.set_ylabel("CPU (%)")
     ax2.set_ylabel("Memory (MB)")
-    plt.title(f"CPU and Memory over time: {dataset}")
-    lines, labels = ax.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax.legend(lines + lines2, labels + labels2, loc="upper right")
-    plt.tight_layout()
+    ax2.set_title(f"CPU and Memory over time: {dataset}")
+    ax.legend(handles, labels, loc="upper right")
+    fig.tight_layout()
     out = PLOTS / f"{dataset}_cpu_mem.png"
-    plt.savefig(out)
-    plt.close()
+    fig.savefig(out)
 
     # Disk and Network rates
-    plt.figure(figsize=(10, 5))
+    fig, ax = _io_canvas()
+    ax.clear()
     for sysname, color in [("spark", "tab:blue"), ("hadoop", "tab:orange")]:
         df = dfs.get(sysname)
         if df is None:
             continue
-        plt.plot(df["t_sec"], df["disk_bytes_total_rate"] / 1e6, label=f"{sysname} Disk MB/s", color=color, alpha=0.8)
+        ax.plot(df["t_sec"], df["disk_bytes_total_rate"] / 1e6, label=f"{sysname} Disk MB/s", color=color, alpha=0.8)
     for sysname, color in [("spark", "tab:blue"), ("hadoop", "tab:orange")]:
         df = dfs.get(sysname)
         if df is None:
             continue
-        plt.plot(df["t_sec"], df["net_bytes_total_rate"] / 1e6, label=f"{sysname} Net MB/s", color=color, linestyle=":", alpha=0.8)
-    plt.xlabel("Time (s)")
-    plt.ylabel("MB/s (Disk / Net)")
-    plt.title(f"I/O rates over time: {dataset}")
-    plt.legend()
-    plt.tight_layout()
+        ax.plot(df["t_sec"], df["net_bytes_total_rate"] / 1e6, label=f"{sysname} Net MB/s", color=color, linestyle=":", alpha=0.8)
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("MB/s (Disk / Net)")
+    ax.set_title(f"I/O rates over time: {dataset}")
+    ax.legend()
+    fig.tight_layout()
     out = PLOTS / f"{dataset}_io_net.png"
-    plt.savefig(out)
-    plt.close()
+    fig.savefig(out)
 
     # Summary bars
     systems_avail = [s for s in SYSTEMS if sums.get(s)]
     if not systems_avail:
         return
-    elapsed = [sums[s]["elapsed_sec"] for s in systems_avail]
-    disk_total = [(sums[s]["disk_read_delta_bytes"] + sums[s]["disk_write_delta_bytes"]) / 1e9 for s in systems_avail]
-    net_total = [(sums[s]["net_sent_delta_bytes"] + sums[s]["net_recv_delta_bytes"]) / 1e6 for s in systems_avail]
-
-    fig, axes = plt.subplots(1, 3, figsize=(12, 4))
+    # One row per system, one column per bar chart, filled in place and scaled once
+    bars = np.zeros((len(systems_avail), 3))
+    for i, s in enumerate(systems_avail):
+        sm = sums[s]
+        bars[i] = (
+            sm["elapsed_sec"],
+            sm["disk_read_delta_bytes"] + sm["disk_write_delta_bytes"],
+            sm["net_sent_delta_bytes"] + sm["net_recv_delta_bytes"],
+        )
+    bars /= (1.0, 1e9, 1e6)  # s, GB, MB
+    elapsed, disk_total, net_total = bars.T
+
+    fig, axes = _summary_canvas()
+    for a in axes:
+        a.clear()
     axes[0].bar(systems_avail, elapsed, color=["tab:blue", "tab:orange"])
     axes[0].set_title("Elapsed (s)")
     axes[1].bar(systems_avail, disk_total, color=["tab:blue", "tab:orange"])
@@ -124,15 +167,15 @@ def plot_dataset(dataset: str) -> None:
     axes[2].bar(systems_avail, net_total, color=["tab:blue", "tab:orange"])
     axes[2].set_title("Total Net (MB)")
     fig.suptitle(f"Performance summary: {dataset}")
-    plt.tight_layout()
+    fig.tight_layout()
     out = PLOTS / f"{dataset}_summary.png"
-    plt.savefig(out)
-    plt.close()
+    fig.savefig(out)
 
 
 def main() -> int:
-    for d in DATASETS:
-        plot_dataset(d)
+    # Datasets are independent, so read + plot them in parallel
+    with Pool(min(len(DATASETS), os.cpu_count() or 1)) as pool:
+        pool.map(plot_dataset, DATASETS)
     print(f"Wrote plots to {PLOTS}")
     return 0
 
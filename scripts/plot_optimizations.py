@@ -13,21 +13,44 @@ Outputs:
 """
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")  # no display needed
 import matplotlib.pyplot as plt
 
+from _catalog import DATASETS, METRICS_ROOT as ROOT, load_summary
+
 
-ROOT = Path("results/metrics")
 PLOTS = ROOT / "plots"
-DATASETS = ["email-EuAll", "web-BerkStan", "soc-LiveJournal1"]
 
 
-def load_summary(system: str, dataset: str) -> dict | None:
-    path = ROOT / system / dataset / "summary.json"
-    if not path.exists():
-        return None
-    return json.loads(path.read_text(encoding="utf-8"))
+# Figures are built once and cleared for each plot
+@lru_cache(maxsize=None)
+def _bar_canvas():
+    return plt.subplots(figsize=(6, 4))
+
+
+@lru_cache(maxsize=None)
+def _line_canvas():
+    return plt.subplots(figsize=(8, 5))
+
+
+def _plot_lines(vals: dict, ylabel: str, title: str, out: Path) -> None:
+    fig, ax = _line_canvas()
+    ax.clear()
+    x = list(range(len(DATASETS)))
+    for sys, color, m in [("spark", "tab:blue", "o"), ("spark_opt", "tab:blue", "^"), ("hadoop", "tab:orange", "s"), ("hadoop_opt", "tab:orange", "D")]:
+        ax.plot(x, vals[sys], marker=m, color=color, label=sys, alpha=0.9 if sys.endswith("opt") else 0.7)
+    ax.set_xticks(x)
+    ax.set_xticklabels(DATASETS, rotation=15)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(out)
 
 
 def series_for(metric_key: str):
@@ -55,35 +78,24 @@ def series_for(metric_key: str):
 def plot_elapsed():
     vals = series_for("elapsed_sec")
     PLOTS.mkdir(parents=True, exist_ok=True)
+    fig, ax = _bar_canvas()
     for d_idx, d in enumerate(DATASETS):
-        plt.figure(figsize=(6, 4))
+        ax.clear()
         cats = ["spark", "spark_opt", "hadoop", "hadoop_opt"]
         y = [vals[c][d_idx] for c in cats]
         colors = ["tab:blue", "tab:blue", "tab:orange", "tab:orange"]
         alphas = [0.6, 0.95, 0.6, 0.95]
-        bars = plt.bar(cats, y, color=colors)
+        bars = ax.bar(cats, y, color=colors)
         for b, a in zip(bars, alphas):
             b.set_alpha(a)
-        plt.ylabel("Elapsed (s)")
-        plt.title(f"Before vs Optimized — {d}")
-        plt.tight_layout()
+        ax.set_ylabel("Elapsed (s)")
+        ax.set_title(f"Before vs Optimized — {d}")
+        fig.tight_layout()
         out = PLOTS / f"optimizations_elapsed_{d}.png"
-        plt.savefig(out)
-        plt.close()
+        fig.savefig(out)
 
     # Combined view across datasets
-    plt.figure(figsize=(8, 5))
-    for sys, color, m in [("spark", "tab:blue", "o"), ("spark_opt", "tab:blue", "^"), ("hadoop", "tab:orange", "s"), ("hadoop_opt", "tab:orange", "D")]:
-        y = vals[sys]
-        x = list(range(len(DATASETS)))
-        plt.plot(x, y, marker=m, color=color, label=sys, alpha=0.9 if sys.endswith("opt") else 0.7)
-    plt.xticks(range(len(DATASETS)), DATASETS, rotation=15)
-    plt.ylabel("Elapsed (s)")
-    plt.title("Elapsed time before vs optimized")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(PLOTS / "optimizations_elapsed.png")
-    plt.close()
+    _plot_lines(vals, "Elapsed (s)", "Elapsed time before vs optimized", PLOTS / "optimizations_elapsed.png")
 
 
 def plot_disk_network():
@@ -91,19 +103,7 @@ def plot_disk_network():
         ("disk_total_gb", "Total disk (GB)", "optimizations_disk.png"),
         ("network_total_mb", "Total network (MB)", "optimizations_network.png"),
     ]:
-        vals = series_for(key)
-        plt.figure(figsize=(8, 5))
-        for sys, color, m in [("spark", "tab:blue", "o"), ("spark_opt", "tab:blue", "^"), ("hadoop", "tab:orange", "s"), ("hadoop_opt", "tab:orange", "D")]:
-            y = vals[sys]
-            x = list(range(len(DATASETS)))
-            plt.plot(x, y, marker=m, color=color, label=sys, alpha=0.9 if sys.endswith("opt") else 0.7)
-        plt.xticks(range(len(DATASETS)), DATASETS, rotation=15)
-        plt.ylabel(label)
-        plt.title(f"{label} before vs optimized")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(PLOTS / fname)
-        plt.close()
+        _plot_lines(series_for(key), label, f"{label} before vs optimized", PLOTS / fname)
 
 
 def main() -> int:
@@ -15,20 +15,18 @@ Writes plots to results/metrics/plots/:
 from __future__ import annotations
 
 import json
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 
+import matplotlib
+
+matplotlib.use("Agg")  # no display needed
 import matplotlib.pyplot as plt
+import pandas as pd
+
+from _catalog import DATASETS, METRICS_ROOT as ROOT, SYSTEMS, load_summary
 
 
-ROOT = Path("results/metrics")
 PLOTS = ROOT / "plots"
-SYSTEMS = ["spark", "hadoop"]
-DATASETS = [
-    "email-EuAll",
-    "web-BerkStan",
-    "soc-LiveJournal1",
-]
 
 
 def load_sizes() -> Dict[str, int]:
@@ -38,62 +36,60 @@ def load_sizes() -> Dict[str, int]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def load_summary(system: str, dataset: str) -> dict | None:
-    path = ROOT / system / dataset / "summary.json"
-    if not path.exists():
-        return None
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def main() -> int:
     PLOTS.mkdir(parents=True, exist_ok=True)
     sizes_bytes = load_sizes()
 
-    # Prepare series per system
-    x_mb: Dict[str, List[float]] = {s: [] for s in SYSTEMS}
-    elapsed: Dict[str, List[float]] = {s: [] for s in SYSTEMS}
-    disk_gb: Dict[str, List[float]] = {s: [] for s in SYSTEMS}
-    net_mb: Dict[str, List[float]] = {s: [] for s in SYSTEMS}
-    mem_mb: Dict[str, List[float]] = {s: [] for s in SYSTEMS}
-
-    # Use same dataset order for both systems
+    # One row per (system, dataset) run, read in a single pass over the summaries
+    rows = []
     for d in DATASETS:
         size_b = sizes_bytes.get(d)
-        size_mb = (size_b / (1024 * 1024)) if size_b is not None else None
+        if size_b is None:
+            continue
         for sysname in SYSTEMS:
             s = load_summary(sysname, d)
-            if s is None or size_mb is None:
+            if s is None:
                 continue
-            x_mb[sysname].append(size_mb)
-            elapsed[sysname].append(float(s.get("elapsed_sec", 0.0)))
-            disk_total = float(s.get("disk_read_delta_bytes", 0.0)) + float(s.get("disk_write_delta_bytes", 0.0))
-            disk_gb[sysname].append(disk_total / (1024 ** 3))
-            net_total = float(s.get("net_sent_delta_bytes", 0.0)) + float(s.get("net_recv_delta_bytes", 0.0))
-            net_mb[sysname].append(net_total / (1024 ** 2))
-            mem_mb[sysname].append(float(s.get("max_mem_used_mb", 0.0)))
-
-    # Helper to plot one metric vs size
-    def plot_metric(name: str, ylabel: str, series: Dict[str, List[float]], logx: bool = True):
-        plt.figure(figsize=(7, 5))
+            rows.append({
+                "system": sysname,
+                "dataset": d,
+                "size_mb": size_b / (1024 * 1024),
+                "elapsed": s.get("elapsed_sec", 0.0),
+                "disk_gb": (s.get("disk_read_delta_bytes", 0) + s.get("disk_write_delta_bytes", 0)) / (1024 ** 3),
+                "net_mb": (s.get("net_sent_delta_bytes", 0) + s.get("net_recv_delta_bytes", 0)) / (1024 ** 2),
+                # null when the run was sampled without the mem probe
+                "mem_mb": s.get("max_mem_used_mb"),
+            })
+    df = pd.DataFrame(rows, columns=["system", "dataset", "size_mb", "elapsed", "disk_gb", "net_mb", "mem_mb"])
+    df[["elapsed", "disk_gb", "net_mb", "mem_mb"]] = df[["elapsed", "disk_gb", "net_mb", "mem_mb"]].astype(float)
+    # Use same dataset order for both systems
+    by_system = {sysname: df[df["system"] == sysname] for sysname in SYSTEMS}
+
+    # Helper to plot one metric vs size, reusing one figure for all metrics
+    fig, ax = plt.subplots(figsize=(7, 5))
+
+    def plot_metric(name: str, ylabel: str, column: str, logx: bool = True):
+        ax.clear()
         for sysname, color, marker in [("spark", "tab:blue", "o"), ("hadoop", "tab:orange", "s")]:
-            if not x_mb[sysname]:
+            runs = by_system[sysname]
+            if runs.empty:
                 continue
-            plt.plot(x_mb[sysname], series[sysname], label=sysname, color=color, marker=marker)
-        plt.xlabel("Dataset size (MB)")
-        plt.ylabel(ylabel)
+            ax.plot(runs["size_mb"], runs[column], label=sysname, color=color, marker=marker)
+        ax.set_xlabel("Dataset size (MB)")
+        ax.set_ylabel(ylabel)
         if logx:
-            plt.xscale("log")
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
+            ax.set_xscale("log")
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
         out = PLOTS / f"scaling_{name}.png"
-        plt.savefig(out)
-        plt.close()
+        fig.savefig(out)
 
-    plot_metric("elapsed", "Elapsed time (s)", elapsed)
-    plot_metric("disk", "Total disk I/O (GB)", disk_gb)
-    plot_metric("network", "Total network (MB)", net_mb)
-    plot_metric("memory", "Max memory (MB)", mem_mb, logx=False)
+    plot_metric("elapsed", "Elapsed time (s)", "elapsed")
+    plot_metric("disk", "Total disk I/O (GB)", "disk_gb")
+    plot_metric("network", "Total network (MB)", "net_mb")
+    plot_metric("memory", "Max memory (MB)", "mem_mb", logx=False)
+    plt.close(fig)
 
     print(f"Wrote scaling plots to {PLOTS}")
     return 0
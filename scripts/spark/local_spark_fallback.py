@@ -9,9 +9,15 @@ Usage:
 from __future__ import annotations
 
 import argparse
-from collections import Counter
+import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # scripts/, for the shared _edges module
+from _edges import MAX_DENSE_ID, read_dst
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser()
@@ -20,20 +26,30 @@ def parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
+def write_tsv(path: Path, counts: pd.Series) -> None:
+    """Write '<key>\t<count>' rows through a 1 MiB buffer (fewer write syscalls than the 8 KiB default)."""
+    with path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        counts.to_csv(f, sep="\t", header=False)
+
+
 def main() -> int:
     args = parse_args()
-    indeg = Counter()
     input_path = Path(args.input)
-    with input_path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s = line.strip()
-            if not s or s.startswith('#'):
-                continue
-            parts = s.split()
-            if len(parts) < 2:
-                continue
-            dst = parts[1]
-            indeg[dst] += 1
+    try:
+        dst = read_dst(input_path, np.int64).to_numpy()
+    except ValueError:
+        # Node ids that are not all integers (or rows missing a dst): count them as strings
+        dst = read_dst(input_path, str)
+    if dst.dtype == np.int64 and (not dst.size or (dst.min() >= 0 and dst.max() <= MAX_DENSE_ID)):
+        # SNAP node ids: dense tally by id instead of hashing every edge
+        counts = np.bincount(dst)
+        nodes = np.flatnonzero(counts)
+        indeg = pd.Series(counts[nodes], index=nodes)
+    else:
+        # Spark output is not ordered by node either, so no sort_index()
+        indeg = pd.Series(dst).value_counts()
+    deg, cnt = np.unique(indeg.to_numpy(), return_counts=True)
+    hist = pd.Series(cnt, index=deg)
 
     out_root = Path(args.out)
     out_indeg = out_root / "indegree"
@@ -42,16 +58,8 @@ def main() -> int:
     out_dist.mkdir(parents=True, exist_ok=True)
 
     # Spark writes part-* files; mimic a single file part-00000
-    with (out_indeg / "part-00000").open("w", encoding="utf-8") as w:
-        for node, d in sorted(indeg.items(), key=lambda kv: kv[0]):
-            w.write(f"{node}\t{d}\n")
-
-    hist = Counter()
-    for d in indeg.values():
-        hist[d] += 1
-    with (out_dist / "part-00000").open("w", encoding="utf-8") as w:
-        for d, c in sorted(hist.items(), key=lambda kv: kv[0]):
-            w.write(f"{d}\t{c}\n")
+    write_tsv(out_indeg / "part-00000", indeg)
+    write_tsv(out_dist / "part-00000", hist)
 
     return 0
 
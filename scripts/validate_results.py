@@ -1,59 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
 from pathlib import Path
 from collections import Counter
 
-# Prefer container mount (/data/results) if present; otherwise use local ./results
-_CONTAINER_RESULTS = Path("/data/results")
-_LOCAL_RESULTS = Path("results")
-_ROOT = _CONTAINER_RESULTS if _CONTAINER_RESULTS.exists() else _LOCAL_RESULTS
+from _catalog import DATASETS, results_root
+
+# Prefer container mount (/data/results) if present; otherwise use local ./results.
+# VALIDATE_RESULTS_ROOT (or --results-root) overrides both.
+_ROOT = results_root()
+if os.environ.get("VALIDATE_RESULTS_ROOT"):
+    _ROOT = Path(os.environ["VALIDATE_RESULTS_ROOT"])
 
 RESULTS = {
     "hadoop": _ROOT / "hadoop",
     "spark": _ROOT / "spark",
 }
 
-DATASETS = [
-    "email-EuAll",
-    "web-BerkStan",
-    "soc-LiveJournal1",
-]
-
 JOBS = ["distribution", "indegree"]
 
 
-def _read_lines(path: Path) -> list[str]:
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        return [ln.strip() for ln in f if ln.strip()]
+def _count_lines(parts: list[Path]) -> Counter:
+    """Count stripped, non-empty lines across part files."""
+    cnt = Counter()
+    for p in parts:
+        # Read each part in one go and let Counter.update tally in C instead of cnt[s] += 1 per line
+        lines = p.read_text(encoding="utf-8", errors="ignore").split("\n")
+        cnt.update(filter(None, map(str.strip, lines)))
+    return cnt
+
+
+def _part_files(base: Path) -> list[Path]:
+    """part-* files in base (no .crc checksums), from a single directory scan."""
+    try:
+        with os.scandir(base) as it:
+            return [
+                Path(e.path) for e in it
+                if e.name.startswith("part-") and not e.name.endswith(".crc") and e.is_file()
+            ]
+    except FileNotFoundError:
+        return []
 
 
 def read_hadoop_output(dataset: str, job: str) -> Counter:
     base = RESULTS["hadoop"] / dataset / job
     # Support either a single part-r-00000 (streaming/local) or multiple part-* files
-    parts = []
-    if (base / "part-r-00000").exists():
+    parts = _part_files(base)
+    if base / "part-r-00000" in parts:
         parts = [base / "part-r-00000"]
-    else:
-        parts = [p for p in base.glob("part-*") if p.is_file()]
     if not parts:
         return Counter()
-    cnt = Counter()
-    for p in parts:
-        for s in _read_lines(p):
-            cnt[s] += 1
-    return cnt
+    return _count_lines(parts)
 
 
 def read_spark_output(dataset: str, job: str) -> Counter:
     base = RESULTS["spark"] / dataset / job
-    if not base.exists():
-        return Counter()
-    parts = [p for p in base.glob("part-*") if p.is_file() and not p.name.endswith(".crc")]
+    parts = _part_files(base)
     if not parts:
         return Counter()
-    cnt = Counter()
-    for p in parts:
-        for s in _read_lines(p):
-            cnt[s] += 1
-    return cnt
+    return _count_lines(parts)
 
 
 def compare(dataset: str, job: str):
@@ -69,7 +76,8 @@ def compare(dataset: str, job: str):
     if not s:
         return {"status": "missing", "message": "Spark output missing"}
 
-    if h == s:
+    # Distinct-line and total-line counts must agree before the full key-by-key comparison can succeed
+    if len(h) == len(s) and sum(h.values()) == sum(s.values()) and h == s:
         return {"status": "match", "message": "Exact match"}
 
     # Differences
@@ -89,7 +97,18 @@ def compare(dataset: str, job: str):
     }
 
 
-def main():
+def main(argv: list[str] | None = None):
+    p = argparse.ArgumentParser(description="Compare Hadoop and Spark outputs line by line")
+    p.add_argument(
+        "--results-root",
+        type=Path,
+        default=_ROOT,
+        help=f"Directory holding hadoop/ and spark/ outputs (default: {_ROOT})",
+    )
+    args = p.parse_args(argv[1:] if argv else [])
+    RESULTS["hadoop"] = args.results_root / "hadoop"
+    RESULTS["spark"] = args.results_root / "spark"
+
     print("Result correctness comparison (Hadoop vs Spark)\n")
     any_mismatch = False
     for dataset in DATASETS:
@@ -116,4 +135,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv)